@@ -0,0 +1,13 @@
+"""AI Lab Watch scraper: subcategory weights, company scores and rubrics."""
+
+__all__ = ["extract_category", "main"]
+
+
+def __getattr__(name: str):
+    # Imported on first use: `python -m ailabwatch.scraper` and the scripts that only need
+    # ailabwatch.full would otherwise load scraper.py as a side effect of the package
+    if name in __all__:
+        from . import scraper
+
+        return getattr(scraper, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,5 @@
+import asyncio
+
+from .scraper import main
+
+asyncio.run(main())
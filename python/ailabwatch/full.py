@@ -0,0 +1,492 @@
+# ailabwatch/full.py
+# Shared by the full scrapers (scraper-v4.py to scraper-v8.py): site constants, the DOM
+# scripts, the revalidated page cache, the plain-HTTP (no browser) parsers and the
+# persistent-context page factory. The scripts keep only their browser-side scraping,
+# build_dataset and main; v7/v8 take just the site constants, RUBRICS_JS and the
+# request filter.
+
+import asyncio
+import hashlib
+import html as html_lib
+import json
+import re
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import httpx
+import lxml.html
+from lxml import etree
+from playwright.async_api import Page
+
+BASE = "https://ailabwatch.org/"
+
+CATEGORIES: List[Tuple[str, str]] = [
+    ("risk-assessment", "Risk assessment"),
+    ("scheming", "Scheming risk prevention"),
+    ("safety-research", "Boosting safety research"),
+    ("misuse", "Misuse prevention"),
+    ("security", "Prep for extreme security"),
+    ("information-sharing", "Risk info sharing"),
+    ("planning", "Planning"),
+]
+
+COMPANIES = ["Anthropic", "DeepMind", "OpenAI", "Meta", "xAI", "Microsoft", "DeepSeek"]
+
+# Requests the scraper never reads. Stylesheets stay: innerText depends on computed
+# styles and would pick up text the site hides.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+SITE_HOST = urlparse(BASE).hostname
+
+# Lean Chromium flags for headless scraping
+LAUNCH_ARGS = ["--disable-gpu", "--disable-dev-shm-usage"]
+
+# Readiness selectors (one string each, no composed locators): a score link on category
+# pages; a rubric block or its toggle on cell pages
+CELL_LINK_SELECTOR = 'a[href*="/cell/"]'
+RUBRIC_READY_SELECTOR = "div.text-sm.links, :is(button, div, span):has-text('details/rubric')"
+
+# Chromium user data dir reused across runs
+PROFILE_DIR = ".pw-profile"
+# Pages issued per browser context before it is closed and relaunched (bounds RSS)
+RECYCLE_CONTEXT_AFTER = 10
+
+COMPANY_SLUG = {
+    "Anthropic": "anthropic",
+    "DeepMind": "deepmind",
+    "OpenAI": "openai",
+    "Meta": "meta",
+    "xAI": "xai",
+    "Microsoft": "microsoft",
+    "DeepSeek": "deepseek",
+}
+
+# Whole category page in one evaluate: for every <h2>, walk its siblings up to the next
+# <h2>, read "Weighted NN% of category", and take each company's NN% from its
+# <a href=".../cell/<company>/<category>"> card (one pass over the region's /cell/
+# links, company read off the href). Returns [{name, weight, scores}].
+CATEGORY_PAGE_JS = """
+(args) => {
+  const { categorySlug, companySlugMap } = args;
+  const weightRe = /Weighted\\s+(\\d+)%\\s+of category/i;
+  const percentRe = /(\\d+)\\s*%/;
+  const CELL_LINK = 'a[href*="/cell/"]';
+  const companyBySlug = Object.fromEntries(
+    Object.entries(companySlugMap).map(([company, cslug]) => [cslug, company])
+  );
+  return [...document.querySelectorAll('h2')].map((h2) => {
+    const region = [];
+    let n = h2.nextElementSibling;
+    while (n && n.tagName !== 'H2') { region.push(n); n = n.nextElementSibling; }
+
+    let weight = null;
+    for (const el of region) {
+      const m = (el.innerText || '').match(weightRe);
+      if (m) { weight = parseInt(m[1], 10); break; }
+    }
+
+    // One pass over the region's /cell/ links: .../cell/<company>/<category>
+    const scores = Object.fromEntries(Object.keys(companySlugMap).map((c) => [c, null]));
+    for (const el of region) {
+      const anchors = el.matches(CELL_LINK) ? [el] : el.querySelectorAll(CELL_LINK);
+      for (const a of anchors) {
+        const parts = a.getAttribute('href').replace(/\\/+$/, '').split('/');
+        const company = companyBySlug[parts[parts.length - 2]];
+        const [cell, , category] = parts.slice(-3);
+        if (cell !== 'cell' || category !== categorySlug) continue;
+        const m = (a.textContent || '').match(percentRe);
+        if (company && m && scores[company] === null) scores[company] = parseInt(m[1], 10);
+      }
+    }
+    return { name: (h2.innerText || '').trim(), weight, scores };
+  });
+}
+"""
+
+# Every rubric on a cell page in one evaluate: click every "Click to show details/rubric"
+# toggle at once, wait one frame, then per title find the header (h3, then h2, then h3
+# by the prefix before a colon) and read the next div.text-sm.links.
+# Returns {title: {description, description_html}}.
+RUBRICS_JS = """
+async (titles) => {
+  const SHOW = 'Click to show details/rubric';
+  // Innermost toggles only, so a wrapper and its button don't both fire (and cancel out).
+  // "hide" toggles are left alone: those rubrics are already open.
+  for (const el of document.querySelectorAll('button, div, span')) {
+    const t = el.textContent || '';
+    if (t.includes(SHOW) && ![...el.children].some((c) => (c.textContent || '').includes(SHOW))) {
+      el.click();
+    }
+  }
+  await new Promise((resolve) => requestAnimationFrame(() => resolve()));
+
+  // Snapshot header texts once (innerText forces layout); exact titles hit the map,
+  // anything else falls back to a substring scan over the snapshot.
+  const headers = [...document.querySelectorAll('h3, h2')].map((el) => ({
+    el,
+    tag: el.tagName,
+    text: (el.innerText || '').trim().toLowerCase(),
+  }));
+  const byText = new Map();
+  for (const h of headers) {
+    const key = `${h.tag}:${h.text}`;
+    if (!byText.has(key)) byText.set(key, h.el);
+  }
+  const findHeader = (tag, needle) => {
+    needle = needle.trim().toLowerCase();
+    const exact = byText.get(`${tag}:${needle}`);
+    if (exact) return exact;
+    const h = headers.find((h) => h.tag === tag && h.text.includes(needle));
+    return h ? h.el : undefined;
+  };
+  // First element after `from` in document order that satisfies `pred` (XPath following::)
+  const following = (from, pred) => {
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_ELEMENT);
+    walker.currentNode = from;
+    for (let n = walker.nextNode(); n; n = walker.nextNode()) {
+      if (!from.contains(n) && pred(n)) return n;
+    }
+    return null;
+  };
+  const isRubric = (el) => el.classList.contains('text-sm') && el.classList.contains('links');
+
+  const found = titles.map((title) => {
+    const prefix = title.split(':')[0].trim();
+    return findHeader('H3', title) || findHeader('H2', title) || findHeader('H3', prefix);
+  });
+  const fallback = document.querySelector('div.text-sm.links');
+  const out = {};
+  titles.forEach((title, i) => {
+    const div = found[i] ? following(found[i], isRubric) || fallback : null;
+    out[title] = div
+      ? { description: div.innerText, description_html: div.innerHTML }
+      : { description: null, description_html: null };
+  });
+  return out;
+}
+"""
+
+# Server-rendered HTML path (no browser): compiled once, applied to lxml trees
+H2_XPATH = etree.XPath("//h2")
+FOLLOWING_SIBLINGS_XPATH = etree.XPath("following-sibling::*")
+ANCHORS_XPATH = etree.XPath("descendant-or-self::a[@href]")
+RUBRIC_HEADERS_XPATH = etree.XPath("//h3 | //h2")
+BODY_TEXT_XPATH = etree.XPath("//body//text()[not(ancestor::script or ancestor::style)]")
+# A header's rubric is the first rubric div after it, unless the next h2/h3 comes first
+NEXT_RUBRIC_XPATH = etree.XPath(
+    "following::*[self::h2 or self::h3"
+    " or (contains(@class, 'text-sm') and contains(@class, 'links'))][1]"
+)
+WEIGHT_RE = re.compile(r"Weighted\s+(\d+)%\s+of category", re.I)
+PERCENT_RE = re.compile(r"(\d+)\s*%")
+# Overview page tokens: any category title, or an "NN % weight" label (one scan for all)
+CATEGORY_BY_TITLE = {title.lower(): title for _, title in CATEGORIES}
+OVERVIEW_TOKEN_RE = re.compile(
+    "(?P<title>"
+    + "|".join(re.escape(t) for t in sorted(CATEGORY_BY_TITLE, key=len, reverse=True))
+    + r")|(?P<weight>\d+)\s*%\s*weight",
+    re.I,
+)
+COMPANY_BY_SLUG = {cslug: company for company, cslug in COMPANY_SLUG.items()}
+
+
+class Cache:
+    """
+    On-disk record of parsed pages: {url -> {"etag", "html_sha256", "parsed"}}.
+    Each URL is revalidated with one HTTP HEAD (ETag / Last-Modified, or a sha256 of
+    the body when the server sends neither); unchanged pages skip the browser entirely.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict] = (
+            json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        )
+        self.client = httpx.AsyncClient(follow_redirects=True, timeout=10)
+
+    async def _fingerprint(self, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """(etag or last-modified, html_sha256); both None if the site can't be reached."""
+        try:
+            r = await self.client.head(url)
+            tag = r.headers.get("etag") or r.headers.get("last-modified")
+            if tag:
+                return tag, None
+            r = await self.client.get(url)
+            return None, hashlib.sha256(r.content).hexdigest()
+        except httpx.HTTPError:
+            return None, None
+
+    async def get_or_compute(
+        self,
+        url: str,
+        compute: Callable[[], Awaitable[Any]],
+        accept: Callable[[Any], bool] = bool,
+    ) -> Any:
+        """
+        Return the cached parse for url if the page is unchanged, else run compute().
+        Only parses that pass accept (by default: non-empty) are stored or reused.
+        """
+        etag, sha = await self._fingerprint(url)
+        rec = self.entries.get(url)
+        if (
+            rec
+            and (etag or sha)
+            and (rec["etag"], rec["html_sha256"]) == (etag, sha)
+            and accept(rec["parsed"])
+        ):
+            return rec["parsed"]
+
+        parsed = await compute()
+        # A failed or partial parse is returned but not kept, so the next run retries it
+        if (etag or sha) and accept(parsed):
+            self.entries[url] = {"etag": etag, "html_sha256": sha, "parsed": parsed}
+        return parsed
+
+    async def close(self) -> None:
+        await self.client.aclose()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, ensure_ascii=False), encoding="utf-8")
+
+
+def weights_from_text(body_text: str) -> Dict[str, Optional[int]]:
+    """
+    Give each category title the first "NN % weight" that starts at most 300 chars after
+    one of its occurrences (a weight may serve several titles). One linear scan of
+    body_text, tracking where each title was last seen.
+    """
+    weights: Dict[str, Optional[int]] = dict.fromkeys(CATEGORY_BY_TITLE.values())
+    last_end: Dict[str, int] = {}
+    for m in OVERVIEW_TOKEN_RE.finditer(body_text):
+        if m.group("title"):
+            last_end[CATEGORY_BY_TITLE[m.group("title").lower()]] = m.end()
+            continue
+        for title, end in last_end.items():
+            if weights[title] is None and m.start() - end <= 300:
+                weights[title] = int(m.group("weight"))
+    return weights
+
+
+def weights_from_html(page_html: str) -> Dict[str, Optional[int]]:
+    """Category weights from raw /categories HTML (visible body text, space separated)."""
+    return weights_from_text(" ".join(BODY_TEXT_XPATH(lxml.html.fromstring(page_html))))
+
+
+async def get_category_weights(cache: Cache) -> Dict[str, Optional[int]]:
+    """
+    Category weights from the overview page, fetched over plain HTTP (no browser page)
+    and reusing the cached parse while the page is unchanged.
+    """
+    url = urljoin(BASE, "categories")
+
+    async def fetch_and_parse() -> Dict[str, Optional[int]]:
+        try:
+            return weights_from_html(await fetch(cache.client, url))
+        except httpx.HTTPError:
+            return dict.fromkeys(CATEGORY_BY_TITLE.values())
+
+    return await cache.get_or_compute(
+        url, fetch_and_parse, accept=lambda parsed: any(w is not None for w in parsed.values())
+    )
+
+
+def norm_space(s: str) -> str:
+    return " ".join(s.split())
+
+
+def inner_html(el) -> str:
+    return html_lib.escape(el.text or "", quote=False) + "".join(
+        etree.tostring(child, encoding="unicode", method="html") for child in el
+    )
+
+
+def parse_category_html(page_html: str, slug: str) -> List[Dict]:
+    """Raw /categories/<slug> HTML counterpart of CATEGORY_PAGE_JS."""
+    subcats = []
+    for h2 in H2_XPATH(lxml.html.fromstring(page_html)):
+        name = norm_space(h2.text_content())
+        if not name:
+            continue
+        region = []
+        for sib in FOLLOWING_SIBLINGS_XPATH(h2):
+            if sib.tag == "h2":
+                break
+            region.append(sib)
+
+        m = WEIGHT_RE.search(" ".join(norm_space(el.text_content()) for el in region))
+        scores: Dict[str, Optional[int]] = dict.fromkeys(COMPANY_SLUG)
+        for el in region:
+            for a in ANCHORS_XPATH(el):
+                # .../cell/<company>/<category>; the first NN% per company wins
+                parts = a.get("href").rstrip("/").split("/")
+                if len(parts) < 3 or parts[-3] != "cell" or parts[-1] != slug:
+                    continue
+                company = COMPANY_BY_SLUG.get(parts[-2])
+                pct = PERCENT_RE.search(a.text_content())
+                if company and pct and scores[company] is None:
+                    scores[company] = int(pct.group(1))
+        subcats.append(
+            {"name": name, "weight": int(m.group(1)) if m else None, "scores": scores}
+        )
+    return subcats
+
+
+def parse_rubrics_html(
+    page_html: str, subcats: List[Dict]
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """Rubrics from raw /cell/xai/<slug> HTML; titles with no (or an empty) rubric div are omitted."""
+    headers = RUBRIC_HEADERS_XPATH(lxml.html.fromstring(page_html))
+    texts = [(h.tag, norm_space(h.text_content()).lower()) for h in headers]
+    rubrics: Dict[str, Dict[str, Optional[str]]] = {}
+    for sc in subcats:
+        title = sc["name"]
+        prefix = title.split(":")[0].strip()
+        # Same precedence as the browser path: h3 title, h2 title, h3 prefix
+        i = next(
+            (
+                i
+                for tag, needle in (("h3", title), ("h2", title), ("h3", prefix))
+                for i, (t, text) in enumerate(texts)
+                if t == tag and needle.lower() in text
+            ),
+            None,
+        )
+        divs = NEXT_RUBRIC_XPATH(headers[i]) if i is not None else []
+        divs = [d for d in divs if d.tag not in ("h2", "h3")]
+        text = divs[0].text_content().strip() if divs else ""
+        if not text:
+            continue
+        rubrics[title] = {"description": text, "description_html": inner_html(divs[0])}
+    return rubrics
+
+
+def drop_unscored(subcats: List[Dict]) -> List[Dict]:
+    """Copies of subcats keeping only the companies that were actually scored."""
+    return [
+        {**sc, "scores": {c: v for c, v in sc["scores"].items() if v is not None}}
+        for sc in subcats
+    ]
+
+
+def category_record(
+    title: str,
+    weight: Optional[int],
+    subcats: List[Dict],
+    rubrics: Dict[str, Dict[str, Optional[str]]],
+) -> Dict:
+    return {
+        "category": title,
+        "weight": weight,
+        "subcategories": [
+            {
+                "name": sc["name"],
+                "weight": sc["weight"],
+                "description": rubrics.get(sc["name"], {}).get("description"),
+                "description_html": rubrics.get(sc["name"], {}).get("description_html"),
+                "scores": sc["scores"],
+            }
+            for sc in subcats
+        ],
+    }
+
+
+async def fetch(client: httpx.AsyncClient, url: str) -> str:
+    r = await client.get(url)
+    r.raise_for_status()
+    return r.text
+
+
+async def build_dataset_without_browser(keep_unscored: bool = True) -> Optional[List[Dict]]:
+    """
+    Fetch the overview, category and cell pages over plain HTTP and parse them in-process.
+    Returns None if the site can't be fetched or the raw HTML lacks the category weights,
+    a category's scores or any rubric (those need JS), in which case build_dataset's
+    Playwright path is used instead.
+    With keep_unscored=False, companies without a score are left out of "scores".
+    """
+    urls = [urljoin(BASE, "categories")]
+    urls += [urljoin(BASE, f"categories/{slug}") for slug, _ in CATEGORIES]
+    urls += [urljoin(BASE, f"cell/xai/{slug}") for slug, _ in CATEGORIES]
+    try:
+        async with httpx.AsyncClient(http2=True, timeout=15, follow_redirects=True) as client:
+            pages = await asyncio.gather(*(fetch(client, u) for u in urls))
+    except httpx.HTTPError:
+        return None
+
+    n = len(CATEGORIES)
+    weights = weights_from_html(pages[0])
+    if all(w is None for w in weights.values()):
+        return None
+    out: List[Dict] = []
+    for (slug, title), cat_html, cell_html in zip(CATEGORIES, pages[1 : n + 1], pages[n + 1 :]):
+        subcats = parse_category_html(cat_html, slug)
+        if not any(v is not None for sc in subcats for v in sc["scores"].values()):
+            return None
+        if not keep_unscored:
+            subcats = drop_unscored(subcats)
+        rubrics = parse_rubrics_html(cell_html, subcats)
+        if not subcats or len(rubrics) < len(subcats):
+            return None
+        out.append(category_record(title, weights.get(title), subcats, rubrics))
+    return out
+
+
+async def block_unneeded(route) -> None:
+    """Abort images/fonts/media and third-party scripts (analytics); pass everything else."""
+    req = route.request
+    if req.resource_type in BLOCKED_RESOURCE_TYPES or (
+        req.resource_type == "script" and urlparse(req.url).hostname != SITE_HOST
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+class PageFactory:
+    """
+    Hands out pages from the persistent context and relaunches that context once
+    `recycle_after` pages have been issued, since Chromium keeps memory from closed pages.
+    A relaunch waits for every outstanding page to close, then reapplies the profile,
+    navigation timeout and route rules.
+    """
+
+    def __init__(self, playwright, recycle_after: int = RECYCLE_CONTEXT_AFTER):
+        self.playwright = playwright
+        self.recycle_after = recycle_after
+        self.context = None
+        self.issued = 0
+        self.open_pages = 0
+        self.cond = asyncio.Condition()
+
+    async def _launch(self) -> None:
+        # Persistent profile: HTTP cache and TLS sessions survive between runs
+        self.context = await self.playwright.chromium.launch_persistent_context(
+            PROFILE_DIR, headless=True, args=LAUNCH_ARGS
+        )
+        # Navigations return at commit; the content waits gate readiness. Hung pages abort fast.
+        self.context.set_default_navigation_timeout(15000)
+        await self.context.route("**/*", block_unneeded)
+        self.issued = 0
+
+    async def new_page(self) -> Page:
+        async with self.cond:
+            if self.context is None:
+                await self._launch()
+            elif self.issued >= self.recycle_after:
+                await self.cond.wait_for(lambda: self.open_pages == 0)
+                if self.issued >= self.recycle_after:  # another waiter may have relaunched
+                    await self.context.close()
+                    await self._launch()
+            page = await self.context.new_page()
+            self.issued += 1
+            self.open_pages += 1
+        return page
+
+    async def close_page(self, page: Page) -> None:
+        await page.close()
+        async with self.cond:
+            self.open_pages -= 1
+            self.cond.notify_all()
+
+    async def close(self) -> None:
+        if self.context is not None:
+            await self.context.close()
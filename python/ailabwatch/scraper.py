@@ -0,0 +1,584 @@
+# ailabwatch/scraper.py
+# Scrapes AI Lab Watch category pages, expands each subcategory's rubric, and exports:
+#   {
+#     "<Category>": {
+#       "<Subcategory>": {
+#         "description_html": "...",
+#         "description": "...",
+#         "weight": <int>,
+#         "official_scores": {"Anthropic": ..., ...}
+#       }, ...
+#     }, ...
+#   }
+#
+# Requirements:
+#   pip install playwright orjson lxml "httpx[http2]"
+#   playwright install
+#
+# Run:
+#   python -m ailabwatch
+#
+# If the site's server-rendered HTML already carries the weights and rubrics, everything
+# is fetched with plain HTTP and Chromium is never started; otherwise Playwright is used.
+#
+# To share one Chromium between several scraper processes, start one run with
+# AILABWATCH_CDP_PORT=9222 and point the others at it with
+# AILABWATCH_CDP_URL=http://127.0.0.1:9222; each attaches its own browser context.
+# The launching run owns that Chromium: once its own categories are done it waits until
+# every attached run has closed its context, then shuts the browser down. Start the
+# attached runs while the launching one is still running.
+#
+# Each category is also appended to ailabwatch_subcategory_rubrics.jsonl as soon as it
+# finishes, so a crashed run still leaves the completed categories on disk.
+
+import asyncio
+import html as html_lib
+import os
+import re
+import sys
+from contextlib import suppress
+from pathlib import Path
+from typing import Dict
+from urllib.parse import urljoin
+
+import httpx
+import lxml.html
+import orjson
+from lxml import etree
+from playwright.async_api import TimeoutError as PWTimeout
+from playwright.async_api import async_playwright
+
+BASE = "https://ailabwatch.org/"
+
+CATEGORIES = [
+    ("risk-assessment", "Risk assessment"),
+    ("scheming", "Scheming risk prevention"),
+    ("safety-research", "Boosting safety research"),
+    ("misuse", "Misuse prevention"),
+    ("security", "Prep for extreme security"),
+    ("information-sharing", "Risk info sharing"),
+    ("planning", "Planning"),
+]
+
+COMPANIES = ["Anthropic", "DeepMind", "OpenAI", "Meta", "xAI", "Microsoft", "DeepSeek"]
+
+WEIGHT_RE = re.compile(r"Weighted\s+(\d+)%\s+of category", re.I)
+# "Image: <Company>" followed by NN% on the next line; one pass picks up every company
+SCORE_RE = re.compile(r"Image:\s*(" + "|".join(map(re.escape, COMPANIES)) + r")\s*\n(\d+)%")
+
+# Resource types the scraper never reads; aborting them cuts bytes and load time.
+# Images are safe to drop: their alt text stays in the DOM either way.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+
+# On-disk rubric cache, validated against the cell page's Last-Modified/ETag
+CACHE_DIR = Path(".cache")
+
+# For each h3/h2 header: its tag, its text, and the first div.text-sm.links after it in
+# document order, before the next h3/h2 (what the toggle expands). The div is usually
+# rendered while collapsed, so its HTML can be read without clicking; null means the
+# click path is needed.
+HEADERS_WITH_RUBRICS_JS = """(els) => {
+    const divs = [...document.querySelectorAll('div.text-sm.links')];
+    const follows = (a, b) => a.compareDocumentPosition(b) & Node.DOCUMENT_POSITION_FOLLOWING;
+    return els.map((h, i) => {
+        const next = els.slice(i + 1).find((x) => !h.contains(x));
+        const d = divs.find((x) => follows(h, x) && !(next && follows(next, x)));
+        const rubric = d && d.innerHTML.trim() ? {html: d.innerHTML, text: d.innerText} : null;
+        return {tag: h.tagName, text: h.innerText, rubric};
+    });
+}"""
+
+# Attach to an already-running Chromium over CDP instead of launching one
+CDP_URL = os.environ.get("AILABWATCH_CDP_URL")
+# When launching, expose the DevTools endpoint on this port for other processes
+CDP_PORT = os.environ.get("AILABWATCH_CDP_PORT")
+
+# Rubric dicts interned by their HTML so identical rubrics across categories share one object
+_RUBRIC_BY_HTML: Dict[str, dict] = {}
+
+# Given the h3/h2 headers and the indices still needing a click, find each header's
+# rubric toggle in one pass (innermost button/div/span with the show/hide wording that
+# follows it) and tag it with data-rubric-toggle=<index> so it can be clicked directly.
+MARK_TOGGLES_JS = """(els, indices) => {
+    const re = /Click to (show|hide) details\\/rubric/;
+    const toggles = [...document.querySelectorAll('button, div, span')].filter(
+        (el) => re.test(el.textContent) && ![...el.children].some((c) => re.test(c.textContent))
+    );
+    return indices.map((i) => {
+        const h = els[i];
+        const t = toggles.find((x) => h.compareDocumentPosition(x) & Node.DOCUMENT_POSITION_FOLLOWING);
+        if (!t) return false;
+        t.setAttribute('data-rubric-toggle', String(i));
+        return true;
+    });
+}"""
+
+# Static-HTML counterparts of the h3/h2 header scan and the "next div.text-sm.links" lookup;
+# the lookup yields the next h3/h2 instead when that comes first (no rubric of its own)
+RUBRIC_HEADERS_XPATH = etree.XPath("//h3 | //h2")
+NEXT_RUBRIC_XPATH = etree.XPath(
+    "following::*[self::h2 or self::h3"
+    " or (self::div and contains(concat(' ', normalize-space(@class), ' '), ' text-sm ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' links '))][1]"
+)
+
+# innerHTML and innerText of one element in a single round-trip
+READ_HTML_AND_TEXT_JS = "el => ({html: el.innerHTML, text: el.innerText})"
+
+# Upper bound (seconds) on the click-and-read rubric pass of one cell page; stragglers are cancelled
+RUBRIC_DEADLINE = 30
+
+# Max categories scraped concurrently (each holds open pages in the shared context)
+MAX_CONCURRENCY = 4
+
+
+def _norm_space(s: str) -> str:
+    return re.sub(r"\s+", " ", s or "").strip()
+
+
+def cache_path(slug: str) -> Path:
+    return CACHE_DIR / f"rubrics_{slug}.json"
+
+
+def _intern_rubric(rubric: dict) -> dict:
+    return _RUBRIC_BY_HTML.setdefault(rubric["html"], rubric)
+
+
+async def _page_validator(context, url: str) -> str | None:
+    """HEAD the page and return its Last-Modified (or ETag) header, if the server sends one."""
+    with suppress(Exception):
+        resp = await context.request.head(url)
+        if resp.ok:
+            return resp.headers.get("last-modified") or resp.headers.get("etag")
+    return None
+
+
+def _load_cached_rubrics(slug: str, validator: str | None) -> Dict[str, dict] | None:
+    if not validator:
+        return None
+    with suppress(OSError, ValueError):
+        cached = orjson.loads(cache_path(slug).read_bytes())
+        if cached.get("validator") == validator:
+            return cached["rubrics"]
+    return None
+
+
+def _rubrics_complete(subcats: list[dict], rubrics: Dict[str, dict]) -> bool:
+    """True when every subcategory has a non-empty rubric."""
+    return all((rubrics.get(sc["name"]) or {}).get("text") for sc in subcats)
+
+
+def _store_rubrics(slug: str, validator: str | None, rubrics: Dict[str, dict]) -> None:
+    if not validator:
+        return
+    path = cache_path(slug)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(orjson.dumps({"validator": validator, "rubrics": rubrics}))
+
+
+async def _open_browser(p):
+    """Connect to the shared Chromium at CDP_URL, or launch a local one."""
+    if CDP_URL:
+        return await p.chromium.connect_over_cdp(CDP_URL)
+    args = [f"--remote-debugging-port={CDP_PORT}"] if CDP_PORT else []
+    return await p.chromium.launch(headless=True, args=args)
+
+
+async def _wait_for_attached_runs(browser) -> None:
+    """Block until no browser contexts are left, i.e. every run attached over CDP is done."""
+    cdp = await browser.new_browser_cdp_session()
+    while (await cdp.send("Target.getBrowserContexts"))["browserContextIds"]:
+        await asyncio.sleep(1)
+    await cdp.detach()
+
+
+async def _block_unneeded(route):
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _acquire_page(context, pool: asyncio.Queue):
+    """Take an idle page from the pool, or open a new one if none is free."""
+    try:
+        return pool.get_nowait()
+    except asyncio.QueueEmpty:
+        return await context.new_page()
+
+
+def _release_page(pool: asyncio.Queue, page) -> None:
+    """Hand a page back for reuse; the next goto() resets its state."""
+    pool.put_nowait(page)
+
+
+# Compiled once; applied to the lxml tree of each rendered category page
+H2_XPATH = etree.XPath("//h2")
+FOLLOWING_SIBLINGS_XPATH = etree.XPath("following-sibling::*")
+
+
+# Elements that start a new line in innerText; everything else runs inline
+BLOCK_TAGS = frozenset(
+    "address article aside blockquote br dd div dl dt figcaption figure footer form h1 h2 h3"
+    " h4 h5 h6 header hr li main nav ol p pre section table tbody td tfoot th thead tr ul".split()
+)
+
+
+def _text_parts(el, parts: list[str]) -> list[str]:
+    """Append el's visible text to parts, innerText-style.
+
+    Inline text runs together (so "85<!-- -->%" stays "85%"); block elements are framed
+    by newlines, and <img> contributes its own 'Image: <alt>' line.
+    """
+    if el.tag == "img":
+        if el.get("alt"):
+            parts.append(f"\nImage: {el.get('alt')}\n")
+        return parts
+    if not isinstance(el.tag, str) or el.tag in ("script", "style"):
+        return parts  # comments / processing instructions / non-visible text
+    block = el.tag in BLOCK_TAGS
+    if block:
+        parts.append("\n")
+    if el.text:
+        parts.append(el.text)
+    for child in el:
+        _text_parts(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+    if block:
+        parts.append("\n")
+    return parts
+
+
+def _parse_subcategories(page_html: str) -> list[dict]:
+    """From /categories/<slug> HTML, collect subcategory name, weight, and per-company scores.
+
+    Text split by React's <!-- --> markers reads as one run, as innerText would:
+
+    >>> _parse_subcategories(
+    ...     "<h2>Evals</h2><p>Weighted <!-- -->20<!-- -->% of category</p>"
+    ...     '<div><a href="/cell/openai/x"><img alt="OpenAI"><span>85<!-- -->%</span></a></div>'
+    ... )
+    [{'name': 'Evals', 'weight': 20, 'official_scores': {'OpenAI': 85}}]
+    """
+    subcats = []
+    tree = lxml.html.fromstring(page_html)
+    for h2 in H2_XPATH(tree):
+        name = _norm_space(h2.text_content())
+        if not name:
+            continue
+
+        # Text of the siblings between this h2 and the next one, one rendered line each
+        parts: list[str] = []
+        for sib in FOLLOWING_SIBLINGS_XPATH(h2):
+            if sib.tag == "h2":
+                break
+            _text_parts(sib, parts)
+        lines = (_norm_space(line) for line in "".join(parts).split("\n"))
+        joined = "\n".join(line for line in lines if line)
+
+        # Weight line ("Weighted NN% of category") sits in the block under the header
+        m = WEIGHT_RE.search(joined)
+        weight = int(m.group(1)) if m else None
+
+        # Parse "Image: Company" followed by NN% (first match per company wins)
+        scores = {}
+        for m in SCORE_RE.finditer(joined):
+            scores.setdefault(m.group(1), int(m.group(2)))
+
+        subcats.append({"name": name, "weight": weight, "official_scores": scores})
+    return subcats
+
+
+async def _extract_subcategories(page) -> list[dict]:
+    """On a /categories/<slug> page, collect subcategory name, weight, and per-company scores."""
+    # One round-trip for the rendered HTML; everything else is in-process lxml parsing
+    return _parse_subcategories(await page.content())
+
+
+def _find_header(header_list: list[tuple[str, str]], exact: Dict[tuple[str, str], int], title: str):
+    """Index of the subcategory header (h3 preferred, h2 fallback; then prefix before colon).
+
+    Exact text is an O(1) lookup; otherwise fall back to has_text-style substring matching.
+    """
+    for tag in ("H3", "H2"):
+        if (tag, title) in exact:
+            return exact[(tag, title)]
+    prefix = title.split(":")[0].strip()
+    candidates = [("H3", title), ("H2", title)] + ([("H3", prefix)] if prefix else [])
+    for tag, needle in candidates:
+        needle = needle.lower()
+        for i, (t, text) in enumerate(header_list):
+            if t == tag and needle in text.lower():
+                return i
+    return None
+
+
+def _index_headers(header_list: list[tuple[str, str]]) -> Dict[tuple[str, str], int]:
+    exact: Dict[tuple[str, str], int] = {}
+    for i, key in enumerate(header_list):
+        exact.setdefault(key, i)
+    return exact
+
+
+def _inner_html(el) -> str:
+    return html_lib.escape(el.text or "", quote=False) + "".join(
+        etree.tostring(child, encoding="unicode", method="html") for child in el
+    )
+
+
+def _parse_static_rubrics(page_html: str, subcats: list[dict]) -> Dict[str, dict] | None:
+    """Rubrics from server-rendered /cell/xai/<slug> HTML; None if any is missing."""
+    tree = lxml.html.fromstring(page_html)
+    headers = RUBRIC_HEADERS_XPATH(tree)
+    header_list = [(h.tag.upper(), _norm_space(h.text_content())) for h in headers]
+    exact = _index_headers(header_list)
+    rubrics: Dict[str, dict] = {}
+    for sc in subcats:
+        i = _find_header(header_list, exact, sc["name"])
+        divs = NEXT_RUBRIC_XPATH(headers[i]) if i is not None else []
+        divs = [d for d in divs if d.tag not in ("h2", "h3")]
+        if not divs or not _norm_space(divs[0].text_content()):
+            return None
+        rubrics[sc["name"]] = {
+            "html": _inner_html(divs[0]),
+            "text": _norm_space(divs[0].text_content()),
+        }
+    return rubrics
+
+
+async def _extract_rubrics(
+    context, pool: asyncio.Queue, slug: str, subcats: list[dict]
+) -> Dict[str, dict]:
+    """Open a representative company cell page (/cell/xai/<slug>), expand each rubric, read HTML/text."""
+    rubrics: Dict[str, dict] = {}
+    page = await _acquire_page(context, pool)
+    try:
+        url = urljoin(BASE, f"cell/xai/{slug}")
+        await page.goto(url, wait_until="commit")
+        with suppress(PWTimeout):
+            await page.wait_for_selector("h3, h2", timeout=8000)
+
+        # Built once per page and shared by every read_rubric() fallback
+        global_div = page.locator("css=div.text-sm.links").first
+
+        # Snapshot every header (and any already-rendered rubric) once; titles are then
+        # resolved in Python instead of running a has_text scan per subcategory.
+        all_headers = page.locator("h3, h2")
+        snapshot = await all_headers.evaluate_all(HEADERS_WITH_RUBRICS_JS)
+        header_list = [(h["tag"], _norm_space(h["text"])) for h in snapshot]
+        exact = _index_headers(header_list)
+
+        async def click_toggle(i: int, marked: bool) -> None:
+            # Click the toggle tagged by MARK_TOGGLES_JS; role-based search near the header
+            # otherwise. No explicit scroll: click() scrolls into view itself, and concurrent
+            # scrolls would fight.
+            if marked:
+                toggle = page.locator(f'[data-rubric-toggle="{i}"]')
+            else:
+                near = all_headers.nth(i).locator("xpath=following::*[position()<=14]")
+                btn = near.get_by_role(
+                    "button",
+                    name=re.compile(r"(Click to )?(show|hide) details/?rubric", re.I),
+                )
+                if not await btn.count():
+                    return
+                toggle = btn.first
+
+            with suppress(Exception):
+                await toggle.click(timeout=3000)
+
+        async def read_rubric(h) -> dict | None:
+            # Read the rubric content right after the header
+            rubric_div = h.locator(
+                "xpath=following::*[contains(@class,'text-sm') and contains(@class,'links')][1]"
+            )
+            try:
+                await rubric_div.wait_for(state="visible", timeout=5000)
+                r = await rubric_div.evaluate(READ_HTML_AND_TEXT_JS)
+                return {"html": r["html"], "text": _norm_space(r["text"])}
+            except PWTimeout:
+                # Global fallback if DOM varies
+                if await global_div.count():
+                    r = await global_div.evaluate(READ_HTML_AND_TEXT_JS)
+                    return {"html": r["html"], "text": _norm_space(r["text"])}
+            return None
+
+        found = []
+        for sc in subcats:
+            title = sc["name"]
+            i = _find_header(header_list, exact, title)
+            if i is None:
+                continue
+            pre = snapshot[i]["rubric"]
+            if pre:
+                # Rubric already in the collapsed DOM: no click needed
+                rubrics[title] = _intern_rubric(
+                    {"html": pre["html"], "text": _norm_space(pre["text"])}
+                )
+            else:
+                found.append((title, i))
+
+        # One evaluate locates and tags every remaining toggle
+        marked = (
+            await all_headers.evaluate_all(MARK_TOGGLES_JS, [i for _, i in found]) if found else []
+        )
+
+        async def extract_one_rubric(title: str, i: int, is_marked: bool) -> dict | None:
+            try:
+                await click_toggle(i, is_marked)
+                return await read_rubric(all_headers.nth(i))
+            except Exception as e:
+                print(f"[WARN] {slug}: rubric for {title!r} failed: {e}", file=sys.stderr)
+                return None
+
+        # Toggles are independent, so the remaining subcategories run concurrently on the
+        # same page. A shared deadline bounds the whole pass: one hung rubric costs at most
+        # RUBRIC_DEADLINE instead of serial per-item timeouts, and finished ones are kept.
+        tasks: Dict[str, asyncio.Task] = {}
+        try:
+            async with asyncio.timeout(RUBRIC_DEADLINE):
+                async with asyncio.TaskGroup() as tg:
+                    for (title, i), is_marked in zip(found, marked):
+                        tasks[title] = tg.create_task(extract_one_rubric(title, i, is_marked))
+        except TimeoutError:
+            pending = [t for t, task in tasks.items() if task.cancelled()]
+            print(f"[WARN] {slug}: rubric deadline hit, skipped {pending}", file=sys.stderr)
+        for title, task in tasks.items():
+            if not task.cancelled() and task.result() is not None:
+                rubrics[title] = _intern_rubric(task.result())
+    finally:
+        _release_page(pool, page)
+    return rubrics
+
+
+async def extract_category(context, pool: asyncio.Queue, slug: str) -> Dict[str, dict]:
+    # Check whether the cell page changed while the category page loads
+    validator_task = asyncio.create_task(
+        _page_validator(context, urljoin(BASE, f"cell/xai/{slug}"))
+    )
+
+    page = await _acquire_page(context, pool)
+    try:
+        url = urljoin(BASE, f"categories/{slug}")
+        # Don't wait for DOMContentLoaded; the h2 subcategory headers are all we need
+        await page.goto(url, wait_until="commit")
+        with suppress(PWTimeout):
+            await page.wait_for_selector("h2", timeout=8000)
+
+        subcats = await _extract_subcategories(page)
+    finally:
+        _release_page(pool, page)
+
+    validator = await validator_task
+    rubrics = _load_cached_rubrics(slug, validator)
+    if rubrics is not None and _rubrics_complete(subcats, rubrics):
+        rubrics = {title: _intern_rubric(rubric) for title, rubric in rubrics.items()}
+    else:
+        rubrics = await _extract_rubrics(context, pool, slug, subcats)
+        # Only a full set is cached; a partial one (deadline hit, failed click, missing
+        # header) would otherwise be served until the page changes, never retried
+        if _rubrics_complete(subcats, rubrics):
+            _store_rubrics(slug, validator, rubrics)
+
+    return _merge(subcats, rubrics)
+
+
+def _merge(subcats: list[dict], rubrics: Dict[str, dict]) -> Dict[str, dict]:
+    out = {}
+    for sc in subcats:
+        name = sc["name"]
+        r = rubrics.get(name, {})
+        out[name] = {
+            "description_html": r.get("html"),
+            "description": r.get("text"),
+            "weight": sc.get("weight"),
+            "official_scores": sc.get("official_scores", {}),
+        }
+    return out
+
+
+async def _scrape_without_browser() -> Dict[str, Dict] | None:
+    """Fetch every category and cell page over plain HTTP and parse them in-process.
+
+    Returns None when the server-rendered HTML lacks the weights, the company scores or
+    any rubric, in which case the pages need JS and the caller falls back to Playwright.
+    """
+    urls = [urljoin(BASE, f"categories/{slug}") for slug, _ in CATEGORIES]
+    urls += [urljoin(BASE, f"cell/xai/{slug}") for slug, _ in CATEGORIES]
+    try:
+        async with httpx.AsyncClient(http2=True, timeout=15, follow_redirects=True) as client:
+            resps = await asyncio.gather(*(client.get(u) for u in urls))
+    except httpx.HTTPError:
+        return None
+    if any(r.status_code != 200 for r in resps):
+        return None
+
+    out: Dict[str, Dict] = {}
+    n = len(CATEGORIES)
+    for (_, cat_name), cat_resp, cell_resp in zip(CATEGORIES, resps[:n], resps[n:]):
+        subcats = _parse_subcategories(cat_resp.text)
+        if not subcats or all(sc["weight"] is None for sc in subcats):
+            return None
+        if not any(sc["official_scores"] for sc in subcats):
+            return None
+        rubrics = _parse_static_rubrics(cell_resp.text, subcats)
+        if rubrics is None:
+            return None
+        out[cat_name] = _merge(subcats, rubrics)
+    return out
+
+
+async def _scrape_with_browser(partial: Path) -> Dict[str, Dict]:
+    out: Dict[str, Dict] = {}
+    with partial.open("wb") as partial_f:
+        async with async_playwright() as p:
+            browser = await _open_browser(p)
+            # Always a fresh context: a shared browser may be serving other workers
+            context = await browser.new_context()
+            await context.route("**/*", _block_unneeded)
+            sem = asyncio.BoundedSemaphore(MAX_CONCURRENCY)
+            # Pages are reused across categories; at most MAX_CONCURRENCY are in use at once
+            pool: asyncio.Queue = asyncio.Queue(maxsize=MAX_CONCURRENCY)
+
+            async def run(slug: str, cat_name: str) -> Dict[str, dict]:
+                async with sem:
+                    print(f"Scraping {cat_name}…", file=sys.stderr)
+                    res = await extract_category(context, pool, slug)
+                # Categories finish out of order; one line each, flushed straight away
+                partial_f.write(orjson.dumps({"category": cat_name, "subcategories": res}) + b"\n")
+                partial_f.flush()
+                return res
+
+            results = await asyncio.gather(
+                *(run(slug, cat_name) for slug, cat_name in CATEGORIES),
+                return_exceptions=True,
+            )
+            for (_, cat_name), res in zip(CATEGORIES, results):
+                if isinstance(res, Exception):
+                    print(f"[WARN] {cat_name} failed: {res}", file=sys.stderr)
+                    out[cat_name] = {}
+                else:
+                    out[cat_name] = res
+            await context.close()
+            if CDP_PORT and not CDP_URL:
+                # We launched the shared browser; closing it now would cut off other runs
+                await _wait_for_attached_runs(browser)
+            await browser.close()
+    return out
+
+
+async def main():
+    path = Path("ailabwatch_subcategory_rubrics.json")
+    out = await _scrape_without_browser()
+    if out is not None:
+        print("Server-rendered HTML is complete; skipped the browser", file=sys.stderr)
+    else:
+        out = await _scrape_with_browser(path.with_suffix(".jsonl"))
+
+    path.write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+    print(path.resolve())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,260 +1,171 @@
 # ailabwatch_full_scraper.py
 # Requirements:
-#   pip install playwright
+#   pip install playwright "httpx[http2]" lxml orjson
 #   playwright install
 #
 # Run:
 #   python ailabwatch_full_scraper.py
 #
 # Output:
-#   ./ailabwatch_categories_subcategories_scores_weights.json
+#   ./ailabwatch_categories_subcategories_scores_weights.json (+ .min.json)
 
 import asyncio
-import json
-import re
 import sys
 from contextlib import suppress
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional
 from urllib.parse import urljoin
 
-from playwright.async_api import TimeoutError as PWTimeout
+import httpx
+import orjson
 from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PWTimeout
 
-BASE = "https://ailabwatch.org/"
-
-# Canonical category slugs and human-readable names (stable as of site structure).
-CATEGORIES: List[Tuple[str, str]] = [
-    ("risk-assessment", "Risk assessment"),
-    ("scheming", "Scheming risk prevention"),
-    ("safety-research", "Boosting safety research"),
-    ("misuse", "Misuse prevention"),
-    ("security", "Prep for extreme security"),
-    ("information-sharing", "Risk info sharing"),
-    ("planning", "Planning"),
-]
-
-COMPANIES = ["Anthropic", "DeepMind", "OpenAI", "Meta", "xAI", "Microsoft", "DeepSeek"]
-
-
-async def get_category_weights(context) -> Dict[str, Optional[int]]:
-    """
-    Visit the Categories overview page and try to parse the per-category weights like "27 % weight".
-    Returns dict: {Readable Category Name -> weight or None}.
-    """
-    page = await context.new_page()
-    url = urljoin(BASE, "categories")
-    await page.goto(url, wait_until="domcontentloaded")
-
-    # Give the page a moment to render dynamic content
-    with suppress(PWTimeout):
-        await page.wait_for_selector("h1, h2, a", timeout=8000)
-
-    # Extract full visible text and try robust regex around each category's title
-    body_text = await page.locator("body").inner_text()
-    weights: Dict[str, Optional[int]] = {}
-
-    for slug, title in CATEGORIES:
-        # Search for "<title> ... <NN> % weight" within a limited window after the title to avoid collisions
-        # Use a DOTALL limited window: up to ~300 chars after the title
-        pattern = re.compile(
-            re.escape(title) + r".{0,300}?(\d+)\s*%\s*weight",
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-        m = pattern.search(body_text)
-        weights[title] = int(m.group(1)) if m else None
-
-    await page.close()
-    return weights
-
-
-async def parse_category_page(context, slug: str) -> List[Dict]:
+from ailabwatch.full import (
+    BASE,
+    CATEGORIES,
+    CATEGORY_PAGE_JS,
+    CELL_LINK_SELECTOR,
+    COMPANY_SLUG,
+    RUBRIC_READY_SELECTOR,
+    RUBRICS_JS,
+    Cache,
+    PageFactory,
+    build_dataset_without_browser,
+    category_record,
+    drop_unscored,
+    fetch,
+    get_category_weights,
+    parse_rubrics_html,
+)
+
+# Max categories scraped concurrently (each keeps its own page(s) open)
+MAX_PARALLEL_PAGES = 3
+
+# Parsed pages keyed by URL, revalidated against the live site on each run. One file
+# per script: the versions don't agree on the shape of a parse (v6 keeps null scores).
+CACHE_PATH = Path(".cache") / "ailabwatch-v4.json"
+
+async def _scrape_category_page(factory: PageFactory, slug: str) -> List[Dict]:
     """
     Scrape a single category page:
       - For each subcategory (h2):
           * subcategory weight ("Weighted NN% of category")
-          * per-company scores (Image: Company ... NN%)
+          * per-company scores (NN% inside each /cell/<company>/<category> link)
     Returns a list of dicts: [{"name": str, "weight": int|None, "scores": {...}}]
     """
-    page = await context.new_page()
-    url = urljoin(BASE, f"categories/{slug}")
-    await page.goto(url, wait_until="domcontentloaded")
-    with suppress(PWTimeout):
-        await page.wait_for_selector("h2", timeout=8000)
-
-    subcats = []
-    headers = page.locator("h2")
-    count = await headers.count()
-    for i in range(count):
-        header = headers.nth(i)
-        name = (await header.inner_text()).strip()
-        if not name:
-            continue
-
-        # Subcategory weight: search a few following siblings for "Weighted NN% of category"
-        weight = None
-        for j in range(1, 10):
-            sib = header.locator(f"xpath=following::*[{j}]")
-            with suppress(Exception):
-                txt = (await sib.inner_text()).strip()
-                m = re.search(r"Weighted\s+(\d+)%\s+of category", txt)
-                if m:
-                    weight = int(m.group(1))
-                    break
-
-        # Extract the text between this h2 and the next h2 to parse company scores
-        span = header.locator("xpath=following-sibling::*")
-        span_count = await span.count()
-        collected = []
-        for k in range(span_count):
-            tag = await span.nth(k).evaluate("n => n.tagName")
-            if tag == "H2":
-                break
-            with suppress(Exception):
-                collected.append((await span.nth(k).inner_text()).strip())
-        joined = "\n".join(collected)
-
-        scores = {}
-        for comp in COMPANIES:
-            m = re.search(rf"Image:\s*{re.escape(comp)}\s*\n(\d+)%", joined)
-            if m:
-                scores[comp] = int(m.group(1))
+    page = await factory.new_page()
+    try:
+        url = urljoin(BASE, f"categories/{slug}")
+        await page.goto(url, wait_until="commit")
+        with suppress(PWTimeout):
+            await page.locator(CELL_LINK_SELECTOR).first.wait_for(timeout=8000)
+
+        subcats = await page.evaluate(
+            CATEGORY_PAGE_JS, {"categorySlug": slug, "companySlugMap": COMPANY_SLUG}
+        )
+    finally:
+        await factory.close_page(page)
+    # Keep only companies that were actually scored
+    return drop_unscored([sc for sc in subcats if sc["name"]])
 
-        subcats.append({"name": name, "weight": weight, "scores": scores})
 
-    await page.close()
-    return subcats
+async def parse_category_page(factory: PageFactory, slug: str, cache: Cache) -> List[Dict]:
+    """Subcategories of one category, reusing the cached parse while its page is unchanged."""
+    return await cache.get_or_compute(
+        urljoin(BASE, f"categories/{slug}"), lambda: _scrape_category_page(factory, slug)
+    )
 
 
-async def scrape_subcategory_rubrics(
-    context, slug: str, subcats: List[Dict]
+async def _scrape_subcategory_rubrics(
+    factory: PageFactory, slug: str, subcats: List[Dict]
 ) -> Dict[str, Dict[str, Optional[str]]]:
     """
     For rubric text per subcategory, open a representative "cell" page (xAI works well)
     and expand the 'Click to show details/rubric' toggle under each subcategory title.
     Returns dict: { subcategory name -> { "description": text, "description_html": html } }
     """
-    page = await context.new_page()
-    url = urljoin(BASE, f"cell/xai/{slug}")
-    await page.goto(url, wait_until="domcontentloaded")
+    page = await factory.new_page()
+    try:
+        url = urljoin(BASE, f"cell/xai/{slug}")
+        await page.goto(url, wait_until="commit")
 
-    with suppress(PWTimeout):
-        await page.wait_for_selector("h3, h2", timeout=8000)
+        with suppress(PWTimeout):
+            # Rubric blocks may be hidden (or not rendered) until their toggle is clicked
+            await page.locator(RUBRIC_READY_SELECTOR).first.wait_for(state="attached", timeout=8000)
 
-    rubrics: Dict[str, Dict[str, Optional[str]]] = {}
-
-    for sc in subcats:
-        title = sc["name"]
-        # Locate the subcategory header (some pages use h3, some use h2)
-        header = page.locator("h3", has_text=title)
-        if await header.count() == 0:
-            header = page.locator("h2", has_text=title)
-        if await header.count() == 0:
-            # Fallback to match prefix before colon (e.g., "Evals: domains..." -> "Evals")
-            prefix = title.split(":")[0].strip()
-            header = page.locator("h3", has_text=prefix)
-        if await header.count() == 0:
-            # Can't find header — skip rubric for this one
-            rubrics[title] = {"description": None, "description_html": None}
-            continue
-
-        h = header.first
-        with suppress(Exception):
-            await h.scroll_into_view_if_needed()
-
-        # Find and click the nearest toggle labelled "Click to show details/rubric" (or "hide" if already open)
-        toggle = h.locator(
-            "xpath=following::*[self::button or self::div or self::span][contains(., 'Click to show details/rubric')][1]"
-        )
-        if await toggle.count() == 0:
-            toggle = h.locator(
-                "xpath=following::*[self::button or self::div or self::span][contains(., 'Click to hide details/rubric')][1]"
-            )
+        return await page.evaluate(RUBRICS_JS, [sc["name"] for sc in subcats])
+    finally:
+        await factory.close_page(page)
 
-        if await toggle.count() == 0:
-            # As a fallback, try role-based search near the header
-            near = h.locator("xpath=following::*[position()<=12]")
-            btn = near.get_by_role(
-                "button", name=re.compile(r"Click to (show|hide) details/rubric", re.I)
-            )
-            if await btn.count() > 0:
-                toggle = btn.first
 
-        try:
-            await toggle.first.click(timeout=3000)
-        except Exception:
-            pass  # maybe already expanded or not a button
+async def scrape_subcategory_rubrics(
+    factory: PageFactory, slug: str, subcats: List[Dict], cache: Cache
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """
+    Rubrics per subcategory: the disk cache (which must cover every requested
+    subcategory) first, then the server-rendered cell HTML; only rubrics missing from
+    that HTML are read through the browser.
+    """
+    titles = [sc["name"] for sc in subcats]
+    url = urljoin(BASE, f"cell/xai/{slug}")
 
-        # The rubric content should now be visible near the header
-        rubric_div = h.locator(
-            "xpath=following::*[contains(@class, 'text-sm') and contains(@class, 'links')][1]"
-        )
+    async def fetch_or_render() -> Dict[str, Dict[str, Optional[str]]]:
         try:
-            await rubric_div.wait_for(state="visible", timeout=5000)
-            html = await rubric_div.inner_html()
-            text = await rubric_div.inner_text()
-            rubrics[title] = {"description": text, "description_html": html}
-        except PWTimeout:
-            # Global fallback: first rubric-like div on page (last resort)
-            global_div = page.locator("css=div.text-sm.links").first
-            if await global_div.count():
-                html = await global_div.inner_html()
-                text = await global_div.inner_text()
-                rubrics[title] = {"description": text, "description_html": html}
-            else:
-                rubrics[title] = {"description": None, "description_html": None}
+            found = parse_rubrics_html(await fetch(cache.client, url), subcats)
+        except httpx.HTTPError:
+            found = {}
+        missing = [sc for sc in subcats if sc["name"] not in found]
+        if missing:
+            found.update(await _scrape_subcategory_rubrics(factory, slug, missing))
+        return found
 
-    await page.close()
-    return rubrics
+    return await cache.get_or_compute(
+        url,
+        fetch_or_render,
+        accept=lambda parsed: all((parsed.get(title) or {}).get("description") for title in titles),
+    )
 
 
 async def build_dataset() -> List[Dict]:
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
+        factory = PageFactory(p)
+        cache = Cache(CACHE_PATH)
 
-        # 1) Category weights from overview page
-        cat_weights = await get_category_weights(context)
+        # 1) Category weights over HTTP, fetched alongside the first categories
+        weights_task = asyncio.create_task(get_category_weights(cache))
+        sem = asyncio.Semaphore(MAX_PARALLEL_PAGES)
 
-        out: List[Dict] = []
+        async def scrape_one(slug: str, title: str) -> Dict:
+            async with sem:
+                print(f"Scraping {title}…", file=sys.stderr)
+                subcats = await parse_category_page(factory, slug, cache)
+                rubrics = await scrape_subcategory_rubrics(factory, slug, subcats, cache)
 
-        # 2) For each category: subcategory weights/scores + rubric
-        for slug, title in CATEGORIES:
-            print(f"Scraping {title}…", file=sys.stderr)
-            subcats = await parse_category_page(context, slug)
-            rubrics = await scrape_subcategory_rubrics(context, slug, subcats)
+            return category_record(title, (await weights_task).get(title), subcats, rubrics)
 
-            out.append(
-                {
-                    "category": title,
-                    "weight": cat_weights.get(title),
-                    "subcategories": [
-                        {
-                            "name": sc["name"],
-                            "weight": sc["weight"],
-                            "description": rubrics.get(sc["name"], {}).get(
-                                "description"
-                            ),
-                            "description_html": rubrics.get(sc["name"], {}).get(
-                                "description_html"
-                            ),
-                            "scores": sc["scores"],
-                        }
-                        for sc in subcats
-                    ],
-                }
-            )
+        # 2) Categories are independent: scrape them concurrently, a few at a time
+        out: List[Dict] = list(
+            await asyncio.gather(*(scrape_one(slug, title) for slug, title in CATEGORIES))
+        )
 
-        await context.close()
-        await browser.close()
+        await cache.close()
+        await factory.close()
         return out
 
 
 def main():
-    data = asyncio.run(build_dataset())
+    # Plain HTTP is enough when the rubrics are server-rendered; otherwise drive a browser
+    data = asyncio.run(build_dataset_without_browser(keep_unscored=False))
+    if data is None:
+        data = asyncio.run(build_dataset())
+    else:
+        print("Server-rendered HTML is complete; skipped the browser", file=sys.stderr)
     path = Path("ailabwatch_categories_subcategories_scores_weights.json")
-    with path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    # Compact copy for machine consumers
+    minified = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    path.with_suffix(".min.json").write_bytes(minified)
     print(str(path.resolve()))
 
 
@@ -1,7 +1,7 @@
 # ailabwatch_full_scraper_v7.py
 # --------------------------------
 # Requirements:
-#   pip install playwright
+#   pip install playwright "httpx[http2]" lxml orjson
 #   playwright install
 #
 # Run:
@@ -9,213 +9,222 @@
 #
 # Output:
 #   ./ailabwatch_categories_subcategories_scores_weights.json
+#   ./ailabwatch_categories_subcategories_scores_weights.jsonl (one line per category,
+#     written as each finishes, so a crashed run keeps the completed ones)
 
 import asyncio
-import json
-import re
 import sys
 from contextlib import suppress
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional
 from urllib.parse import urljoin
 
-from playwright.async_api import ElementHandle, Locator, Page, async_playwright
+import orjson
+from playwright.async_api import ElementHandle, Page, async_playwright
 from playwright.async_api import TimeoutError as PWTimeout
 
-BASE = "https://ailabwatch.org/"
-
-CATEGORIES: List[Tuple[str, str]] = [
-    ("risk-assessment", "Risk assessment"),
-    ("scheming", "Scheming risk prevention"),
-    ("safety-research", "Boosting safety research"),
-    ("misuse", "Misuse prevention"),
-    ("security", "Prep for extreme security"),
-    ("information-sharing", "Risk info sharing"),
-    ("planning", "Planning"),
-]
-
-COMPANIES = ["Anthropic", "DeepMind", "OpenAI", "Meta", "xAI", "Microsoft", "DeepSeek"]
-COMPANY_SLUG = {
-    "Anthropic": "anthropic",
-    "DeepMind": "deepmind",
-    "OpenAI": "openai",
-    "Meta": "meta",
-    "xAI": "xai",
-    "Microsoft": "microsoft",
-    "DeepSeek": "deepseek",
+from ailabwatch.full import (
+    BASE,
+    CATEGORIES,
+    COMPANY_SLUG,
+    PROFILE_DIR,
+    RUBRICS_JS,
+    block_unneeded,
+)
+
+# Max categories scraped concurrently (two pages per worker)
+MAX_PARALLEL_WORKERS = 4
+
+# On-disk HTTP cache kept next to the profile, capped at 100 MB
+LAUNCH_ARGS = ["--disk-cache-dir=./.chrome-cache", "--disk-cache-size=104857600"]
+
+# All category weights on the overview page in one evaluate. Each category's weight is
+# the first "NN % weight" in the smallest block around one of its /categories/<slug>
+# links (or its heading) that doesn't already span another category's link; links in
+# nav bars never qualify, so the card's own link is found. Categories without a card
+# fall back to "<title> ... NN % weight" within 300 chars in the page text.
+CATEGORY_WEIGHTS_JS = """
+(categories) => {
+  const weightRe = /(\\d+)\\s*%\\s*weight/i;
+  const escape = (s) => s.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&');
+  const headings = [...document.querySelectorAll('h2, h3')];
+  const cardWeight = (el) => {
+    for (; el && el !== document.body; el = el.parentElement) {
+      const hrefs = new Set(
+        [...el.querySelectorAll('a[href*="/categories/"]')].map((a) => a.getAttribute('href'))
+      );
+      if (hrefs.size > 1) break;
+      const m = (el.innerText || '').match(weightRe);
+      if (m) return parseInt(m[1], 10);
+    }
+    return null;
+  };
+  let bodyText = null; // only read when a card lookup misses
+  const out = {};
+  for (const [slug, title] of categories) {
+    // Every link to the category (nav, breadcrumbs, the card itself), then its heading;
+    // the first one that sits inside a card with a weight wins
+    const anchors = [
+      ...document.querySelectorAll(
+        `a[href$="/categories/${slug}"], a[href$="/categories/${slug}/"]`
+      ),
+      ...headings.filter((h) => (h.innerText || '').includes(title)),
+    ];
+    let weight = null;
+    for (const a of anchors) {
+      weight = cardWeight(a);
+      if (weight !== null) break;
+    }
+    if (weight === null) {
+      if (bodyText === null) bodyText = document.body.innerText || '';
+      const m = bodyText.match(
+        new RegExp(escape(title) + '[\\\\s\\\\S]{0,300}?' + weightRe.source, 'i')
+      );
+      weight = m ? parseInt(m[1], 10) : null;
+    }
+    out[title] = weight;
+  }
+  return out;
 }
+"""
+
+# "Weighted NN% of category" among the next few siblings of an <h2>, in one evaluate
+GET_WEIGHT_JS = """
+(h2) => {
+  let n = h2.nextElementSibling;
+  for (let i=0; i<8 && n; i++, n = n.nextElementSibling) {
+    const t = (n.innerText || '').trim();
+    const m = t.match(/Weighted\\s+(\\d+)%\\s+of category/i);
+    if (m) return parseInt(m[1], 10);
+  }
+  return null;
+}
+"""
+
+# Per-company scores in the region between an <h2> and the next <h2>. The region's
+# /cell/ anchors are grouped by company in one pass; for each company's anchors, climb
+# to a card-ish container (staying inside the region) and take the first NN% in it;
+# else in a few siblings after the container; else in the anchor itself.
+# Returns {company: int | null}.
+EXTRACT_SCORES_JS = """
+({ h2, categorySlug, companySlugMap }) => {
+  const region = [];
+  for (let n = h2.nextElementSibling; n && n.tagName !== 'H2'; n = n.nextElementSibling) {
+    region.push(n);
+  }
+  const percentRe = /(\\d+)\\s*%/;
+  const cardishWords = ['card', 'grid', 'panel', 'tile', 'item'];
+  // Class tokens rather than className, which is not a string on SVG nodes
+  const isCardish = (el) => {
+    if (!el || !el.classList) return false;
+    for (const cls of el.classList) {
+      const c = cls.toLowerCase();
+      if (cardishWords.some((w) => c.includes(w))) return true;
+    }
+    return false;
+  };
+  const tryNode = (el) => {
+    const text = (el && el.textContent) ? el.textContent : '';
+    const m = text.match(percentRe);
+    return m ? parseInt(m[1], 10) : null;
+  };
+
+  // Classify the region's /cell/ anchors by company in one pass (.../cell/<company>/<category>)
+  const companyBySlug = Object.fromEntries(
+    Object.entries(companySlugMap).map(([company, cslug]) => [cslug, company])
+  );
+  const anchorsByCompany = {};
+  const cellLinks = region.flatMap((el) => [
+    ...(el.matches('a[href*="/cell/"]') ? [el] : []),
+    ...el.querySelectorAll('a[href*="/cell/"]'),
+  ]);
+  for (const a of cellLinks) {
+    const [cslug, category] = a.getAttribute('href').split('/cell/')[1].split(/[/?#]/);
+    const company = companyBySlug[cslug];
+    if (company && category === categorySlug) (anchorsByCompany[company] ||= []).push(a);
+  }
+
+  const scores = {};
+  for (const company of Object.keys(companySlugMap)) {
+    let val = null;
+    for (const a of anchorsByCompany[company] || []) {
+      let container = a;
+      for (let i = 0; i < 6 && container; i++) {
+        if (isCardish(container)) break;
+        container = container.parentElement;
+        if (container === h2.parentElement) container = null;
+      }
+      if (!container) container = a;
+
+      val = tryNode(container);
+      if (val != null) break;
+
+      let sib = container.nextElementSibling;
+      for (let j = 0; j < 4 && sib && val == null; j++, sib = sib.nextElementSibling) {
+        val = tryNode(sib);
+      }
+      if (val != null) break;
+
+      val = tryNode(a);
+      if (val != null) break;
+    }
+    scores[company] = val;
+  }
+  return scores;
+}
+"""
 
-PERCENT_RE = re.compile(r"(\d+)\s*%")
+# The extraction functions above and the shared RUBRICS_JS, installed once per context
+# with add_init_script so every page compiles them on load; helpers then call them by
+# name instead of sending the source with each evaluate.
+EXTRACT_BUNDLE = f"""
+window.__extract = {{
+  weights: {CATEGORY_WEIGHTS_JS},
+  subcategoryWeight: {GET_WEIGHT_JS},
+  scores: {EXTRACT_SCORES_JS},
+  rubrics: {RUBRICS_JS},
+}};
+"""
 
 
 async def get_category_weights(page: Page) -> Dict[str, Optional[int]]:
-    await page.goto(urljoin(BASE, "categories"), wait_until="domcontentloaded")
+    await page.goto(urljoin(BASE, "categories"), wait_until="commit")
     with suppress(PWTimeout):
-        await page.wait_for_selector("h1, h2, a", timeout=8000)
-    body_text = await page.locator("body").inner_text()
-    weights: Dict[str, Optional[int]] = {}
-    for slug, title in CATEGORIES:
-        m = re.search(
-            re.escape(title) + r".{0,300}?(\d+)\s*%\s*weight",
-            body_text,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-        weights[title] = int(m.group(1)) if m else None
-    return weights
-
-
-async def _slice_elements_between_h2s(
-    page: Page, header: Locator
-) -> List[ElementHandle]:
-    """Return a list of element handles between this <h2> and the next <h2>."""
-    return (
-        await page.evaluate_handle(
-            """(h2) => {
-            const out = [];
-            let n = h2.nextElementSibling;
-            while (n && n.tagName !== 'H2') {
-                out.push(n);
-                n = n.nextElementSibling;
-            }
-            return out;
-        }""",
-            await header.element_handle(),
-        )
-        .get_properties()
-        .then(lambda m: [v for v in m.values()])
-    )
-
-
-async def _region_query_selector_all(
-    page: Page, header: Locator, selector: str
-) -> List[ElementHandle]:
-    """Query elements within the region (between this <h2> and the next <h2>)."""
-    # Grab nodes in region and query inside each
-    nodes = await _slice_elements_between_h2s(page, header)
-    results: List[ElementHandle] = []
-    for node in nodes:
-        # Query inside this node
-        handles = await page.query_selector_all(f":scope >>> :is({selector})")
-        # Above line queries whole document; limit to subtree via JS:
-        sub = await page.evaluate_handle(
-            """(root, sel) => Array.from(root.querySelectorAll(sel))""", node, selector
-        )
-        props = await sub.get_properties()
-        results.extend([v for v in props.values()])
-    return results
+        await page.wait_for_selector("h1, h2, a", timeout=15000)
+    return await page.evaluate("(a) => window.__extract.weights(a)", CATEGORIES)
 
 
 async def _extract_scores_from_region(
-    page: Page, header: Locator, category_slug: str
+    page: Page, header: ElementHandle, category_slug: str
 ) -> Dict[str, Optional[int]]:
-    """Find per-company scores by locating the anchor to /cell/<company>/<category>,
-    then scanning its nearest card container's text for 'NN%'. Fallback: scan adjacent siblings."""
-    scores: Dict[str, Optional[int]] = {c: None for c in COMPANIES}
-
-    # Collect all anchors in the region once
-    anchors = await _region_query_selector_all(page, header, "a[href]")
-    # Build a map from company -> list of matching anchors in this region
-    comp_anchors: Dict[str, List[ElementHandle]] = {c: [] for c in COMPANIES}
-
-    for a in anchors:
-        href = await a.get_attribute("href")
-        if not href:
-            continue
-        for company, cslug in COMPANY_SLUG.items():
-            # Match anchors that include the company slug and (ideally) the current category slug
-            if f"/cell/{cslug}/" in href and category_slug in href:
-                comp_anchors[company].append(a)
-
-    # Helper that scans a DOM node's text for NN%
-    async def scan_for_percent(node: ElementHandle) -> Optional[int]:
-        txt = (await node.inner_text()).strip()
-        m = PERCENT_RE.search(txt)
-        return int(m.group(1)) if m else None
-
-    # For each company, try: same anchor -> closest card container -> siblings
-    for company in COMPANIES:
-        if not comp_anchors[company]:
-            continue
-        anchor = comp_anchors[company][0]
-
-        # 1) Try closest card container
-        card = await page.evaluate_handle(
-            """(a) => {
-                // Walk up to a likely card container
-                const isCard = (el) => {
-                    if (!el || !el.classList) return false;
-                    const c = el.className.toLowerCase();
-                    return c.includes('card') || c.includes('item') or c.includes('grid') || c.includes('tile') || c.includes('panel');
-                };
-                let n = a;
-                for (let i=0; i<5 && n; i++) {
-                    if (isCard(n)) return n;
-                    n = n.parentElement;
-                }
-                // Fallback: <a> itself or its parent
-                return a.closest('a, div, li, article, section') || a.parentElement || a;
-            }""",
-            anchor,
-        )
-        val = await scan_for_percent(card)
-        if val is not None:
-            scores[company] = val
-            continue
-
-        # 2) Try a few next siblings from the card
-        try:
-            sib_score = await page.evaluate_handle(
-                """(root) => {
-                    let n = root.nextElementSibling;
-                    for (let i=0;i<4 && n;i++){
-                        const t = n.textContent || '';
-                        const m = t.match(/(\\d+)\\s*%/);
-                        if (m) return parseInt(m[1], 10);
-                        n = n.nextElementSibling;
-                    }
-                    return null;
-                }""",
-                card,
-            )
-            if sib_score:
-                scores[company] = int(await sib_score.json_value())
-                continue
-        except Exception:
-            pass
-
-        # 3) Last resort: scan the anchor itself
-        val = await scan_for_percent(anchor)
-        if val is not None:
-            scores[company] = val
-
-    return scores
+    """Per-company scores for the region under this <h2>, computed in one evaluate."""
+    return await page.evaluate(
+        "(a) => window.__extract.scores(a)",
+        {
+            "h2": header,
+            "categorySlug": category_slug,
+            "companySlugMap": COMPANY_SLUG,
+        },
+    )
 
 
 async def parse_category_page(page: Page, slug: str) -> List[Dict]:
     """For a category page, return list of subcats with weight + per-company scores."""
-    await page.goto(urljoin(BASE, f"categories/{slug}"), wait_until="domcontentloaded")
+    await page.goto(urljoin(BASE, f"categories/{slug}"), wait_until="commit")
     with suppress(PWTimeout):
-        await page.wait_for_selector("h2", timeout=8000)
+        await page.wait_for_selector("h2", timeout=15000)
 
     subcats: List[Dict] = []
-    headers: Locator = page.locator("h2")
-    count = await headers.count()
-    for i in range(count):
-        header = headers.nth(i)
-        name = (await header.inner_text()).strip()
+    # Resolve every <h2> handle and its text once; both evaluates below reuse the handle
+    headers = await page.query_selector_all("h2")
+    names = await asyncio.gather(*(h.inner_text() for h in headers))
+    for header, name in zip(headers, names):
+        name = name.strip()
         if not name:
             continue
 
         # Subcategory weight nearby
-        weight = None
-        for j in range(1, 10):
-            sib = header.locator(f"xpath=following::*[{j}]")
-            with suppress(Exception):
-                txt = (await sib.inner_text()).strip()
-                mm = re.search(r"Weighted\s+(\d+)%\s+of category", txt)
-                if mm:
-                    weight = int(mm.group(1))
-                    break
+        weight = await page.evaluate("(h2) => window.__extract.subcategoryWeight(h2)", header)
 
         # Scores by robust DOM probing inside the subcategory region
         scores = await _extract_scores_from_region(page, header, slug)
@@ -225,100 +234,65 @@ async def parse_category_page(page: Page, slug: str) -> List[Dict]:
     return subcats
 
 
-async def click_near_toggle(header: Locator) -> None:
-    toggle = header.locator(
-        "xpath=following::*[self::button or self::div or self::span]"
-        "[contains(., 'Click to show details/rubric') or contains(., 'Click to hide details/rubric')][1]"
-    )
-    try:
-        if await toggle.count():
-            await toggle.first.click(timeout=3000)
-    except Exception:
-        pass
+async def open_cell_page(page: Page, slug: str) -> None:
+    await page.goto(urljoin(BASE, f"cell/xai/{slug}"), wait_until="commit")
+    with suppress(PWTimeout):
+        await page.wait_for_selector("h3, h2", timeout=15000)
 
 
 async def scrape_subcategory_rubrics(
-    page: Page, slug: str, subcats: List[Dict]
+    page: Page, subcats: List[Dict]
 ) -> Dict[str, Dict[str, Optional[str]]]:
-    await page.goto(urljoin(BASE, f"cell/xai/{slug}"), wait_until="domcontentloaded")
-    with suppress(PWTimeout):
-        await page.wait_for_selector("h3, h2", timeout=8000)
-
-    rubrics: Dict[str, Dict[str, Optional[str]]] = {}
-    for sc in subcats:
-        title = sc["name"]
-
-        header = page.locator("h3", has_text=title)
-        if await header.count() == 0:
-            header = page.locator("h2", has_text=title)
-        if await header.count() == 0:
-            prefix = title.split(":")[0].strip()
-            header = page.locator("h3", has_text=prefix)
-        if await header.count() == 0:
-            rubrics[title] = {"description": None, "description_html": None}
-            continue
-
-        h = header.first
-        with suppress(Exception):
-            await h.scroll_into_view_if_needed()
+    return await page.evaluate(
+        "(a) => window.__extract.rubrics(a)", [sc["name"] for sc in subcats]
+    )
 
-        await click_near_toggle(h)
 
-        rubric_div = h.locator(
-            "xpath=following::*[contains(@class, 'text-sm') and contains(@class, 'links')][1]"
-        )
-        try:
-            await rubric_div.wait_for(state="visible", timeout=5000)
-            html = await rubric_div.inner_html()
-            text = await rubric_div.inner_text()
-            rubrics[title] = {"description": text, "description_html": html}
-        except PWTimeout:
-            global_div = page.locator("css=div.text-sm.links").first
-            if await global_div.count():
-                html = await global_div.inner_html()
-                text = await global_div.inner_text()
-                rubrics[title] = {"description": text, "description_html": html}
-            else:
-                rubrics[title] = {"description": None, "description_html": None}
-
-    return rubrics
-
-
-async def build_dataset() -> List[Dict]:
+async def build_dataset(partial_f: BinaryIO) -> List[Dict]:
     async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-
-        # 1) Category weights
-        page1 = await context.new_page()
-        cat_weights = await get_category_weights(page1)
-        await page1.close()
-
-        out: List[Dict] = []
-
-        # 2) For each category: subcategory + scores + rubric
-        for slug, title in CATEGORIES:
-            print(f"Scraping {title}…", file=sys.stderr)
-
-            page2 = await context.new_page()
-            subcats = await parse_category_page(page2, slug)
-            await page2.close()
-
-            page3 = await context.new_page()
-            rubrics = await scrape_subcategory_rubrics(page3, slug, subcats)
-            await page3.close()
-
-            out.append(
-                {
+        # One persistent profile for the whole run: HTTP cache and compiled JS survive
+        # between runs. Workers share it and keep their own pages.
+        context = await p.chromium.launch_persistent_context(
+            PROFILE_DIR, headless=True, args=LAUNCH_ARGS
+        )
+        await context.route("**/*", block_unneeded)
+        await context.add_init_script(script=EXTRACT_BUNDLE)
+
+        # 1) Category weights, fetched alongside the first categories
+        async def fetch_weights() -> Dict[str, Optional[int]]:
+            page = await context.new_page()
+            weights = await get_category_weights(page)
+            await page.close()
+            return weights
+
+        weights_task = asyncio.create_task(fetch_weights())
+
+        # 2) Categories are independent: a few workers take them from a queue. Each
+        #    worker reuses its two pages for every category it takes.
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(CATEGORIES):
+            queue.put_nowait(item)
+        out: List[Dict] = [{} for _ in CATEGORIES]
+
+        async def worker() -> None:
+            page_cat = await context.new_page()
+            page_rubric = await context.new_page()
+            while not queue.empty():
+                i, (slug, title) = queue.get_nowait()
+                print(f"Scraping {title}…", file=sys.stderr)
+                # The rubric page loads while the category page is read
+                subcats, _ = await asyncio.gather(
+                    parse_category_page(page_cat, slug), open_cell_page(page_rubric, slug)
+                )
+                rubrics = await scrape_subcategory_rubrics(page_rubric, subcats)
+                out[i] = {
                     "category": title,
-                    "weight": cat_weights.get(title),
+                    "weight": (await weights_task).get(title),
                     "subcategories": [
                         {
                             "name": sc["name"],
                             "weight": sc["weight"],
-                            "description": rubrics.get(sc["name"], {}).get(
-                                "description"
-                            ),
+                            "description": rubrics.get(sc["name"], {}).get("description"),
                             "description_html": rubrics.get(sc["name"], {}).get(
                                 "description_html"
                             ),
@@ -327,18 +301,24 @@ async def build_dataset() -> List[Dict]:
                         for sc in subcats
                     ],
                 }
-            )
+                # Categories finish out of order; one line each, flushed straight away
+                partial_f.write(orjson.dumps(out[i]) + b"\n")
+                partial_f.flush()
+            await page_cat.close()
+            await page_rubric.close()
+
+        n_workers = min(MAX_PARALLEL_WORKERS, len(CATEGORIES))
+        await asyncio.gather(*(worker() for _ in range(n_workers)))
 
         await context.close()
-        await browser.close()
         return out
 
 
 def main():
-    data = asyncio.run(build_dataset())
     out_path = Path("ailabwatch_categories_subcategories_scores_weights.json")
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with out_path.with_suffix(".jsonl").open("wb") as partial_f:
+        data = asyncio.run(build_dataset(partial_f))
+    out_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     print(str(out_path.resolve()))
 
 
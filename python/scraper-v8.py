@@ -1,7 +1,7 @@
 # ailabwatch_full_scraper_v8.py
 # --------------------------------
 # Requirements:
-#   pip install playwright
+#   pip install playwright "httpx[http2]" lxml orjson
 #   playwright install
 #
 # Run:
@@ -9,275 +9,265 @@
 #
 # Output:
 #   ./ailabwatch_categories_subcategories_scores_weights.json
+#   ./ailabwatch_categories_subcategories_scores_weights.jsonl (one line per category,
+#     written as each finishes, so a crashed run keeps the completed ones)
 
 import asyncio
-import json
-import re
 import sys
 from contextlib import suppress
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import BinaryIO, Dict, List, Optional
 from urllib.parse import urljoin
 
-from playwright.async_api import Locator, Page, async_playwright
+import orjson
+from playwright.async_api import Page, async_playwright
 from playwright.async_api import TimeoutError as PWTimeout
 
-BASE = "https://ailabwatch.org/"
-
-CATEGORIES: List[Tuple[str, str]] = [
-    ("risk-assessment", "Risk assessment"),
-    ("scheming", "Scheming risk prevention"),
-    ("safety-research", "Boosting safety research"),
-    ("misuse", "Misuse prevention"),
-    ("security", "Prep for extreme security"),
-    ("information-sharing", "Risk info sharing"),
-    ("planning", "Planning"),
-]
-
-COMPANIES = ["Anthropic", "DeepMind", "OpenAI", "Meta", "xAI", "Microsoft", "DeepSeek"]
-COMPANY_SLUG = {
-    "Anthropic": "anthropic",
-    "DeepMind": "deepmind",
-    "OpenAI": "openai",
-    "Meta": "meta",
-    "xAI": "xai",
-    "Microsoft": "microsoft",
-    "DeepSeek": "deepseek",
+from ailabwatch.full import (
+    BASE,
+    CATEGORIES,
+    COMPANY_SLUG,
+    PROFILE_DIR,
+    RUBRICS_JS,
+    block_unneeded,
+)
+
+# Max categories scraped concurrently (two pages per worker)
+MAX_PARALLEL_WORKERS = 4
+
+# On-disk HTTP cache kept next to the profile, capped at 100 MB
+LAUNCH_ARGS = ["--disk-cache-dir=./.chrome-cache", "--disk-cache-size=104857600"]
+
+# All category weights on the overview page in one evaluate. Each category's weight is
+# the first "NN % weight" in the smallest block around one of its /categories/<slug>
+# links (or its heading) that doesn't already span another category's link; links in
+# nav bars never qualify, so the card's own link is found. Categories without a card
+# fall back to "<title> ... NN % weight" within 300 chars in the page text.
+CATEGORY_WEIGHTS_JS = """
+(categories) => {
+  const weightRe = /(\\d+)\\s*%\\s*weight/i;
+  const escape = (s) => s.replace(/[.*+?^${}()|[\\]\\\\]/g, '\\\\$&');
+  const headings = [...document.querySelectorAll('h2, h3')];
+  const cardWeight = (el) => {
+    for (; el && el !== document.body; el = el.parentElement) {
+      const hrefs = new Set(
+        [...el.querySelectorAll('a[href*="/categories/"]')].map((a) => a.getAttribute('href'))
+      );
+      if (hrefs.size > 1) break;
+      const m = (el.innerText || '').match(weightRe);
+      if (m) return parseInt(m[1], 10);
+    }
+    return null;
+  };
+  let bodyText = null; // only read when a card lookup misses
+  const out = {};
+  for (const [slug, title] of categories) {
+    // Every link to the category (nav, breadcrumbs, the card itself), then its heading;
+    // the first one that sits inside a card with a weight wins
+    const anchors = [
+      ...document.querySelectorAll(
+        `a[href$="/categories/${slug}"], a[href$="/categories/${slug}/"]`
+      ),
+      ...headings.filter((h) => (h.innerText || '').includes(title)),
+    ];
+    let weight = null;
+    for (const a of anchors) {
+      weight = cardWeight(a);
+      if (weight !== null) break;
+    }
+    if (weight === null) {
+      if (bodyText === null) bodyText = document.body.innerText || '';
+      const m = bodyText.match(
+        new RegExp(escape(title) + '[\\\\s\\\\S]{0,300}?' + weightRe.source, 'i')
+      );
+      weight = m ? parseInt(m[1], 10) : null;
+    }
+    out[title] = weight;
+  }
+  return out;
 }
+"""
+
+# Whole category page in one evaluate. For every <h2>: the region is its siblings up to
+# the next <h2>; the weight is the first "Weighted NN% of category" among the next 8
+# siblings; each company's score is the first NN% found for its
+# <a href*="/cell/<company>/<category>"> anchor, scanning (in order) the anchor's card-ish
+# container, a few siblings after that container, then the anchor itself.
+# Returns [{name, weight, scores}] with null for anything not found.
+CATEGORY_PAGE_JS = """
+(args) => {
+  const { categorySlug, companySlugMap } = args;
+  const weightRe = /Weighted\\s+(\\d+)%\\s+of category/i;
+  const percentRe = /(\\d+)\\s*%/;
+  const cardishWords = ['card', 'grid', 'panel', 'tile', 'item'];
+  // Class tokens rather than className, which is not a string on SVG nodes
+  const isCardish = (el) => {
+    if (!el || !el.classList) return false;
+    for (const cls of el.classList) {
+      const c = cls.toLowerCase();
+      if (cardishWords.some((w) => c.includes(w))) return true;
+    }
+    return false;
+  };
+  const tryNode = (el) => {
+    const text = (el && el.textContent) ? el.textContent : '';
+    const m = text.match(percentRe);
+    return m ? parseInt(m[1], 10) : null;
+  };
+
+  const out = [];
+  for (const h2 of document.querySelectorAll('h2')) {
+    const name = (h2.innerText || '').trim();
+    if (!name) continue;
+
+    const region = [];
+    for (let n = h2.nextElementSibling; n && n.tagName !== 'H2'; n = n.nextElementSibling) {
+      region.push(n);
+    }
 
+    let weight = null;
+    for (const el of region.slice(0, 8)) {
+      const m = (el.innerText || '').trim().match(weightRe);
+      if (m) { weight = parseInt(m[1], 10); break; }
+    }
 
-async def get_category_weights(page: Page) -> Dict[str, Optional[int]]:
-    """Parse 'NN % weight' for each category on the overview page."""
-    await page.goto(urljoin(BASE, "categories"), wait_until="domcontentloaded")
-    with suppress(PWTimeout):
-        await page.wait_for_selector("h1, h2, a", timeout=8000)
-
-    body_text = await page.locator("body").inner_text()
-    weights: Dict[str, Optional[int]] = {}
-    for slug, title in CATEGORIES:
-        m = re.search(
-            re.escape(title) + r".{0,300}?(\d+)\s*%\s*weight",
-            body_text,
-            flags=re.IGNORECASE | re.DOTALL,
-        )
-        weights[title] = int(m.group(1)) if m else None
-    return weights
-
+    const scores = {};
+    for (const [company, cslug] of Object.entries(companySlugMap)) {
+      const sel = `a[href*="/cell/${cslug}/${categorySlug}"]`;
+      const anchors = region.flatMap((el) => [
+        ...(el.matches(sel) ? [el] : []),
+        ...el.querySelectorAll(sel),
+      ]);
+      let val = null;
+      for (const a of anchors) {
+        // Climb to a card-ish container without leaving this subcategory's region
+        let container = a;
+        for (let i = 0; i < 6 && container; i++) {
+          if (isCardish(container)) break;
+          container = container.parentElement;
+          if (container === h2.parentElement) container = null;
+        }
+        if (!container) container = a;
 
-async def parse_category_page(page: Page, slug: str) -> List[Dict]:
-    """
-    For a category page, return list of subcats with:
-      - subcategory weight ("Weighted NN% of category")
-      - per-company scores (by DOM evaluation inside the page)
-    """
-    await page.goto(urljoin(BASE, f"categories/{slug}"), wait_until="domcontentloaded")
-    with suppress(PWTimeout):
-        await page.wait_for_selector("h2", timeout=8000)
-
-    # JS helper to extract weight near a given <h2>
-    get_weight_js = """
-    (h2) => {
-      // Scan a few following siblings for "Weighted NN% of category"
-      let n = h2.nextElementSibling;
-      for (let i=0; i<8 && n; i++, n = n.nextElementSibling) {
-        const t = (n.innerText || '').trim();
-        const m = t.match(/Weighted\\s+(\\d+)%\\s+of category/i);
-        if (m) return parseInt(m[1], 10);
-      }
-      return null;
-    }
-    """
+        val = tryNode(container);
+        if (val != null) break;
 
-    # JS helper to compute per-company scores in the region between this h2 and the next h2.
-    # Strategy:
-    # 1) Build a detached container with all nodes between <h2> and the next <h2>.
-    # 2) For each company, find <a href*="/cell/<company>/<category>"> anchors inside that region.
-    # 3) For each anchor, walk up to a likely "card" container; scan its textContent for "NN%".
-    # 4) If not found, scan a few next siblings. If still not found, scan the anchor text itself.
-    extract_scores_js = """
-    (h2, categorySlug, companySlugMap) => {
-      // 1) collect region nodes
-      const regionNodes = [];
-      let n = h2.nextElementSibling;
-      while (n && n.tagName !== 'H2') { regionNodes.push(n); n = n.nextElementSibling; }
-
-      // Build a detached region to query reliably without affecting layout
-      const region = document.createElement('div');
-      for (const el of regionNodes) region.appendChild(el.cloneNode(true));
-
-      const scores = {};
-      const percentRe = /(\\d+)\\s*%/;
-
-      const companies = Object.keys(companySlugMap);
-      for (const company of companies) {
-        const cslug = companySlugMap[company];
-        let val = null;
-
-        // 2) anchors inside region
-        const anchors = region.querySelectorAll(`a[href*="/cell/${cslug}/${categorySlug}"]`);
-        for (const a of anchors) {
-          // 3) climb to a "card-ish" container and scan for % text
-          const isCardish = (el) => {
-            if (!el || !el.classList) return false;
-            const c = (el.className || "").toLowerCase();
-            return c.includes('card') || c.includes('grid') || c.includes('panel') || c.includes('tile') || c.includes('item');
-          };
-          let container = a;
-          for (let i=0; i<6 && container; i++) {
-            if (isCardish(container)) break;
-            container = container.parentElement;
-          }
-          if (!container) container = a.closest('a, div, li, article, section') || a.parentElement || a;
-
-          const tryNode = (el) => {
-            const text = (el && el.textContent) ? el.textContent : '';
-            const m = text.match(percentRe);
-            return m ? parseInt(m[1], 10) : null;
-          };
-
-          // scan container
-          val = tryNode(container);
-          if (val != null) break;
-
-          // scan a few next siblings
-          let sib = container.nextElementSibling;
-          for (let j=0; j<4 && sib && val == null; j++, sib = sib.nextElementSibling) {
-            val = tryNode(sib);
-          }
-          if (val != null) break;
-
-          // last resort: scan the anchor itself
-          val = tryNode(a);
-          if (val != null) break;
+        let sib = container.nextElementSibling;
+        for (let j = 0; j < 4 && sib && val == null; j++, sib = sib.nextElementSibling) {
+          val = tryNode(sib);
         }
+        if (val != null) break;
 
-        scores[company] = val;
+        val = tryNode(a);
+        if (val != null) break;
       }
-      return scores;
+      scores[company] = val;
     }
-    """
-
-    subcats: List[Dict] = []
+    out.push({ name, weight, scores });
+  }
+  return out;
+}
+"""
 
-    headers: Locator = page.locator("h2")
-    count = await headers.count()
-    for i in range(count):
-        header = headers.nth(i)
-        name = (await header.inner_text()).strip()
-        if not name:
-            continue
+# The extraction functions above and the shared RUBRICS_JS, installed once per context
+# with add_init_script so every page compiles them on load; helpers then call them by
+# name instead of sending the source with each evaluate.
+EXTRACT_BUNDLE = f"""
+window.__extract = {{
+  weights: {CATEGORY_WEIGHTS_JS},
+  categoryPage: {CATEGORY_PAGE_JS},
+  rubrics: {RUBRICS_JS},
+}};
+"""
 
-        # subcategory weight
-        weight = await page.evaluate(get_weight_js, await header.element_handle())
 
-        # per-company scores in this region (fully in-page evaluation)
-        scores = await page.evaluate(
-            extract_scores_js, await header.element_handle(), slug, COMPANY_SLUG
-        )
+async def get_category_weights(page: Page) -> Dict[str, Optional[int]]:
+    """Parse 'NN % weight' for each category on the overview page."""
+    await page.goto(urljoin(BASE, "categories"), wait_until="commit")
+    with suppress(PWTimeout):
+        await page.wait_for_selector("h1, h2, a", timeout=15000)
 
-        subcats.append({"name": name, "weight": weight, "scores": scores})
+    return await page.evaluate("(a) => window.__extract.weights(a)", CATEGORIES)
 
-    return subcats
 
+async def parse_category_page(page: Page, slug: str) -> List[Dict]:
+    """
+    For a category page, return list of subcats with:
+      - subcategory weight ("Weighted NN% of category")
+      - per-company scores
+    all read by the bundled CATEGORY_PAGE_JS in a single evaluate.
+    """
+    await page.goto(urljoin(BASE, f"categories/{slug}"), wait_until="commit")
+    with suppress(PWTimeout):
+        await page.wait_for_selector("h2", timeout=15000)
 
-async def click_near_toggle(header: Locator) -> None:
-    """Click the nearest rubric toggle after the given header (h2/h3),
-    matching both 'show' and 'hide' variants."""
-    toggle = header.locator(
-        "xpath=following::*[self::button or self::div or self::span]"
-        "[contains(., 'Click to show details/rubric') or contains(., 'Click to hide details/rubric')][1]"
+    return await page.evaluate(
+        "(a) => window.__extract.categoryPage(a)",
+        {"categorySlug": slug, "companySlugMap": COMPANY_SLUG},
     )
-    try:
-        if await toggle.count():
-            await toggle.first.click(timeout=3000)
-    except Exception:
-        pass  # it may already be expanded
 
 
-async def scrape_subcategory_rubrics(
-    page: Page, slug: str, subcats: List[Dict]
-) -> Dict[str, Dict[str, Optional[str]]]:
-    """Open a representative company 'cell' page and extract rubric for each subcat."""
-    await page.goto(urljoin(BASE, f"cell/xai/{slug}"), wait_until="domcontentloaded")
+async def open_cell_page(page: Page, slug: str) -> None:
+    """Open a representative company 'cell' page for this category."""
+    await page.goto(urljoin(BASE, f"cell/xai/{slug}"), wait_until="commit")
     with suppress(PWTimeout):
-        await page.wait_for_selector("h3, h2", timeout=8000)
-
-    rubrics: Dict[str, Dict[str, Optional[str]]] = {}
-    for sc in subcats:
-        title = sc["name"]
-
-        header = page.locator("h3", has_text=title)
-        if await header.count() == 0:
-            header = page.locator("h2", has_text=title)
-        if await header.count() == 0:
-            prefix = title.split(":")[0].strip()
-            header = page.locator("h3", has_text=prefix)
-        if await header.count() == 0:
-            rubrics[title] = {"description": None, "description_html": None}
-            continue
-
-        h = header.first
-        with suppress(Exception):
-            await h.scroll_into_view_if_needed()
-
-        await click_near_toggle(h)
-
-        rubric_div = h.locator(
-            "xpath=following::*[contains(@class, 'text-sm') and contains(@class, 'links')][1]"
-        )
-        try:
-            await rubric_div.wait_for(state="visible", timeout=5000)
-            html = await rubric_div.inner_html()
-            text = await rubric_div.inner_text()
-            rubrics[title] = {"description": text, "description_html": html}
-        except PWTimeout:
-            # global fallback
-            global_div = page.locator("css=div.text-sm.links").first
-            if await global_div.count():
-                html = await global_div.inner_html()
-                text = await global_div.inner_text()
-                rubrics[title] = {"description": text, "description_html": html}
-            else:
-                rubrics[title] = {"description": None, "description_html": None}
-
-    return rubrics
-
-
-async def build_dataset() -> List[Dict]:
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-
-        # 1) Category weights
-        page1 = await context.new_page()
-        cat_weights = await get_category_weights(page1)
-        await page1.close()
+        await page.wait_for_selector("h3, h2", timeout=15000)
 
-        out: List[Dict] = []
 
-        # 2) For each category: subcategories + scores + rubrics
-        for slug, title in CATEGORIES:
-            print(f"Scraping {title}…", file=sys.stderr)
-
-            page2 = await context.new_page()
-            subcats = await parse_category_page(page2, slug)
-            await page2.close()
+async def scrape_subcategory_rubrics(
+    page: Page, subcats: List[Dict]
+) -> Dict[str, Dict[str, Optional[str]]]:
+    """Extract the rubric for each subcat from a page opened by open_cell_page."""
+    return await page.evaluate(
+        "(a) => window.__extract.rubrics(a)", [sc["name"] for sc in subcats]
+    )
 
-            page3 = await context.new_page()
-            rubrics = await scrape_subcategory_rubrics(page3, slug, subcats)
-            await page3.close()
 
-            out.append(
-                {
+async def build_dataset(partial_f: BinaryIO) -> List[Dict]:
+    async with async_playwright() as p:
+        # One persistent profile for the whole run: HTTP cache and compiled JS survive
+        # between runs. Workers share it and keep their own pages.
+        context = await p.chromium.launch_persistent_context(
+            PROFILE_DIR, headless=True, args=LAUNCH_ARGS
+        )
+        await context.route("**/*", block_unneeded)
+        await context.add_init_script(script=EXTRACT_BUNDLE)
+
+        # 1) Category weights, fetched alongside the first categories
+        async def fetch_weights() -> Dict[str, Optional[int]]:
+            page = await context.new_page()
+            weights = await get_category_weights(page)
+            await page.close()
+            return weights
+
+        weights_task = asyncio.create_task(fetch_weights())
+
+        # 2) Categories are independent: a few workers take them from a queue. Each
+        #    worker reuses its two pages for every category it takes.
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(CATEGORIES):
+            queue.put_nowait(item)
+        out: List[Dict] = [{} for _ in CATEGORIES]
+
+        async def worker() -> None:
+            page_cat = await context.new_page()
+            page_rubric = await context.new_page()
+            while not queue.empty():
+                i, (slug, title) = queue.get_nowait()
+                print(f"Scraping {title}…", file=sys.stderr)
+                # The rubric page loads while the category page is read
+                subcats, _ = await asyncio.gather(
+                    parse_category_page(page_cat, slug), open_cell_page(page_rubric, slug)
+                )
+                rubrics = await scrape_subcategory_rubrics(page_rubric, subcats)
+                out[i] = {
                     "category": title,
-                    "weight": cat_weights.get(title),
+                    "weight": (await weights_task).get(title),
                     "subcategories": [
                         {
                             "name": sc["name"],
                             "weight": sc["weight"],
-                            "description": rubrics.get(sc["name"], {}).get(
-                                "description"
-                            ),
+                            "description": rubrics.get(sc["name"], {}).get("description"),
                             "description_html": rubrics.get(sc["name"], {}).get(
                                 "description_html"
                             ),
@@ -286,18 +276,24 @@ async def build_dataset() -> List[Dict]:
                         for sc in subcats
                     ],
                 }
-            )
+                # Categories finish out of order; one line each, flushed straight away
+                partial_f.write(orjson.dumps(out[i]) + b"\n")
+                partial_f.flush()
+            await page_cat.close()
+            await page_rubric.close()
+
+        n_workers = min(MAX_PARALLEL_WORKERS, len(CATEGORIES))
+        await asyncio.gather(*(worker() for _ in range(n_workers)))
 
         await context.close()
-        await browser.close()
         return out
 
 
 def main():
-    data = asyncio.run(build_dataset())
     out_path = Path("ailabwatch_categories_subcategories_scores_weights.json")
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with out_path.with_suffix(".jsonl").open("wb") as partial_f:
+        data = asyncio.run(build_dataset(partial_f))
+    out_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     print(str(out_path.resolve()))
 
 